@@ -231,6 +231,76 @@ def answer_info(tutorial_package_name, problem_set_name, tutorial_name):
     return json.dumps(response_dict)
 
 
+@action('answer_info_bulk')
+def answer_info_bulk(tutorial_package_name, tutorials):
+    """
+    Return information on the server copies of the student's answers for all
+    of the given tutorials.
+
+    This is equivalent to calling answer_info for each tutorial, but requires
+    only a single request.
+
+    Args:
+      tutorial_package_name (str): The name of the tutorial package (eg, for
+          UQ students, this will be something like 'CSSE1001Tutorials').
+      tutorials (str): A JSON-encoded list of two-element lists.  The first
+          element of each list is the name of the problem set, and the second
+          is the name of the tutorial problem.
+
+    Returns:
+      A dictionary mapping problem set names to dictionaries, which in turn map
+      tutorial names to information on the answer.
+
+      The information on each answer is itself a dictionary, with the same
+      'hash' and 'timestamp' keys as the response to answer_info.
+
+      Tutorials with no answer on the server are omitted.
+
+    Raises:
+      ActionError: If the list of tutorials is not valid JSON, or if any of
+          its elements is not a pair of names.
+
+    """
+    # authenticate the user
+    user = get_user_and_add()
+
+    try:
+        tutorials = json.loads(tutorials)
+    except ValueError:
+        raise ActionError('Invalid tutorial list')
+
+    if not isinstance(tutorials, list) or not all(
+                isinstance(item, list) and len(item) == 2
+                and all(isinstance(name, basestring) for name in item)
+                for item in tutorials):
+        raise ActionError('Invalid tutorial list')
+
+    # grab our data
+    response_dict = {}
+
+    for problem_set_name, tutorial_name in tutorials:
+        # form values are byte strings; keep the names consistent with those
+        problem_set_name = problem_set_name.encode('utf8')
+        tutorial_name = tutorial_name.encode('utf8')
+
+        answer_hash = support.get_answer_hash(
+            user, tutorial_package_name, problem_set_name, tutorial_name
+        )
+        timestamp = support.get_answer_modification_time(
+            user, tutorial_package_name, problem_set_name, tutorial_name
+        )
+        if answer_hash is None or timestamp is None:
+            continue
+
+        problem_set_dict = response_dict.setdefault(problem_set_name, {})
+        problem_set_dict[tutorial_name] = {
+            'hash': answer_hash,
+            'timestamp': timestamp,
+        }
+
+    return json.dumps(response_dict)
+
+
 @action('submit')
 def submit_answer(tutorial_hash, code, num_attempts):
     """
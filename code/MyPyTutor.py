@@ -235,7 +235,7 @@ def update_mpt(force_update=False):
     """
     # if we've made it to here, we assume that we are running in the MyPyTutor
     # directory and that these imports will succeed
-    from tutorlib.gui.app.app import VERSION
+    from tutorlib.config.shared import VERSION
     from tutorlib.gui.app.support import safely_extract_zipfile
     from tutorlib.interface.web_api import WebAPI, WebAPIError
 
@@ -612,7 +612,7 @@ def print_version():
     Print the current version of MyPyTutor.
 
     """
-    from tutorlib.gui.app.app import VERSION
+    from tutorlib.config.shared import VERSION
     print(VERSION)
 
 
@@ -1,6 +1,8 @@
 import os
 
 
+VERSION = '3.0.17'
+
 MPT_DIR = os.path.join(os.path.expanduser('~'), '.mptrc')
 if not os.path.exists(MPT_DIR):
     os.mkdir(MPT_DIR)
@@ -10,6 +10,7 @@ import datetime, time, shutil
 from tutorlib.config.attempts import TutorialAttempts
 from tutorlib.config.configuration \
         import add_tutorial, load_config, save_config
+from tutorlib.config.shared import VERSION
 from tutorlib.gui.app.menu import TutorialMenuDelegate, TutorialMenu
 from tutorlib.gui.app.output \
         import AnalysisOutput, TestOutput, TestOutputDelegate
@@ -30,9 +31,6 @@ from tutorlib.interface.web_api import WebAPI, WebAPIError
 from tutorlib.online.sync import SyncClient
 
 
-VERSION = '3.0.17'
-
-
 class TutorialApp(TutorialMenuDelegate, TutorEditorDelegate,
         TestOutputDelegate):
     """
@@ -103,6 +103,9 @@ class TutorialPackage():
         self.name = name
         self.options = options
 
+        self._hash_index = None
+        self._b32_index = None
+
         path = os.path.join(options.tut_dir, TutorialPackage.CONFIG_FILE)
 
         try:
@@ -314,7 +317,7 @@ class TutorialPackage():
         Return the tutorial with the given hash.
 
         Args:
-          tutorial_hash (str): The hash of the tutorial to return.
+          tutorial_hash (bytes): The hash of the tutorial to return.
 
         Returns:
           The tutorial with the given hash.
@@ -325,11 +328,33 @@ class TutorialPackage():
           earliest appearance in the earliest problem set) will be returned.
 
         """
-        for problem_set in self.problem_sets:
-            for tutorial in problem_set:
-                if tutorial.hash == tutorial_hash:
-                    return tutorial
-        return None
+        if self._hash_index is None:
+            index = {}
+            for problem_set in self.problem_sets:
+                for tutorial in problem_set:
+                    index.setdefault(tutorial.hash, tutorial)
+            self._hash_index = index
+        return self._hash_index.get(tutorial_hash)
+
+    @property
+    def b32_index(self):
+        """
+        Return a dictionary mapping base32-encoded tutorial hashes to tutorials.
+
+        The keys are the same as Tutorial.b32_hash, and are the format in which
+        the server identifies tutorials.
+
+        If multiple tutorials with the same hash exist, the first (with the
+        earliest appearance in the earliest problem set) will be used.
+
+        """
+        if self._b32_index is None:
+            index = {}
+            for problem_set in self.problem_sets:
+                for tutorial in problem_set:
+                    index.setdefault(tutorial.b32_hash, tutorial)
+            self._b32_index = index
+        return self._b32_index
 
     def problem_set_containing(self, tutorial):
         """
@@ -1,4 +1,5 @@
 import ast
+import base64
 from hashlib import sha512
 import os
 import datetime
@@ -196,6 +197,7 @@ class Tutorial():
 
         # initial values for lazy properties
         self._hash = None
+        self._b32_hash = None
         self._preload_code_text = None
 
     def _get_answer_hash(self):
@@ -279,6 +281,21 @@ class Tutorial():
             self._hash = hash_obj.digest()
         return self._hash
 
+    @property
+    def b32_hash(self):
+        """
+        Return the hash of the tutorial problem, encoded as a base32 string.
+
+        This is the format used to identify tutorials to the server.
+
+        Returns:
+          The base32 encoding of Tutorial.hash, as a str.
+
+        """
+        if self._b32_hash is None:
+            self._b32_hash = base64.b32encode(self.hash).decode('ascii')
+        return self._b32_hash
+
     def _assert_valid_file(self, file_name):
         """
         Assert that the given filename exists in the tutorial package.
@@ -1,16 +1,24 @@
 import base64
+from concurrent.futures import ThreadPoolExecutor
 import json
 import urllib.parse
 import webbrowser
 
-from tutorlib.online.exceptions import AuthError, RequestError, NullResponse
+try:
+    from orjson import loads as json_loads  # much faster, if installed
+except ImportError:
+    from json import loads as json_loads
+
+from tutorlib.online.exceptions \
+        import AuthError, BadResponse, RequestError, NullResponse
 from tutorlib.online.session import SessionManager
+from tutorlib.utils.decorators import ttl_cached
 from tutorlib.utils.tmp import retrieve
 
 
 HELP_URL = 'http://csse1001.uqcloud.net/mpt3/help'
 VISUALISER_URL \
-    = 'http://pythontutor.com/visualize.html'
+    = 'http://pythontutor.com/visualize.html#code={code}&py=3&mode=display'
 
 
 class WebAPIError(Exception):
@@ -40,6 +48,17 @@ class WebAPIError(Exception):
         self.details = details
 
 
+class UnknownActionError(WebAPIError):
+    """
+    An error indicating that the server does not support the requested action.
+
+    This will be raised when talking to an older server, which predates the
+    action in question.
+
+    """
+    pass
+
+
 class WebAPI():
     """
     Interface to the MyPyTutor website.  Encapsulates all online functionality
@@ -53,6 +72,10 @@ class WebAPI():
       LATE_OK (constant): The server indicated that the action or request was
           late, but the user has been permitted to complete this action late.
       MISSING (constant): The relevant submission is missing.
+      VERSION_TTL (constant): How long, in seconds, to cache the result of
+          get_version.
+      TIMESTAMP_TTL (constant): How long, in seconds, to cache the result of
+          get_tutorials_timestamp.
 
     Attributes:
       session_manager (SessionManager): The underlying session manager.
@@ -65,6 +88,9 @@ class WebAPI():
 
     RESPONSES = {OK, LATE, LATE_OK, MISSING}
 
+    VERSION_TTL = 300
+    TIMESTAMP_TTL = 60
+
     def __init__(self, listener=None):
         """
         Initialise a new WebAPI object.
@@ -73,16 +99,31 @@ class WebAPI():
         one WebAPI, but this is not prohibited.
 
         """
-        self.session_manager = SessionManager()
+        self.session_manager = SessionManager(listener=self._session_changed)
         self.listener = listener if listener is not None else lambda _: None
 
+        # cached result of session_manager.is_logged_in (None if unknown)
+        self._logged_in = None
+
+        self._ttl_cache = {}
+
     @property
     def is_logged_in(self):
         """
         Return whether the user is currently logged in.
 
         """
-        return self.session_manager.is_logged_in()
+        if self._logged_in is None:
+            self._logged_in = self.session_manager.is_logged_in()
+        return self._logged_in
+
+    def _session_changed(self):
+        """
+        Update the cached login state when the session manager logs the user
+        in or out.
+
+        """
+        self._logged_in = self.session_manager.is_logged_in()
 
     @property
     def user(self):
@@ -125,6 +166,8 @@ class WebAPI():
                 details=str(e),
             ) from e
 
+        self._logged_in = success
+        self.invalidate_cache()
         self.listener(success)
 
         return success
@@ -139,6 +182,8 @@ class WebAPI():
         if self.is_logged_in:
             try:
                 self.session_manager.logout()
+                self._logged_in = False
+                self.invalidate_cache()
                 self.listener(False)
             except Exception as e:
                 raise WebAPIError(
@@ -146,6 +191,13 @@ class WebAPI():
                     details=str(e),
                 ) from e
 
+    def invalidate_cache(self):
+        """
+        Discard all cached server responses.
+
+        """
+        self._ttl_cache.clear()
+
     # visualiser
     def visualise(self, code_text):
         """
@@ -155,7 +207,7 @@ class WebAPI():
 
         """
         # format is url (percent) encoded, except spaces are replaced by +
-        encoded_text = urllib.parse.quote(code_text, ' ').replace(' ', '+')
+        encoded_text = urllib.parse.quote_plus(code_text)
         url = VISUALISER_URL.format(code=encoded_text)
 
         # just open it in the browser
@@ -190,7 +242,9 @@ class WebAPI():
           If NullResponse is raised, return None.
 
         Raises:
-          WebAPIError: If an AuthError or RequestError is encountered.
+          UnknownActionError: If the server does not recognise the action.
+          WebAPIError: If an AuthError, RequestError or BadResponse is
+              encountered.
 
         """
         if require_login and not self.login():
@@ -202,6 +256,7 @@ class WebAPI():
         try:
             return f(values)
         except AuthError as e:
+            self._logged_in = None  # re-check with the session manager
             raise WebAPIError(
                 message='Authentication Failure',
                 details=str(e),
@@ -213,6 +268,17 @@ class WebAPI():
             ) from e
         except NullResponse as e:
             return None
+        except BadResponse as e:
+            # the server responds to unknown actions with an HTML error page
+            if 'Unknown action' in str(e):
+                raise UnknownActionError(
+                    message='Unknown Action',
+                    details=str(e),
+                ) from e
+            raise WebAPIError(
+                message='Invalid Response',
+                details=str(e),
+            ) from e
 
     def _get(self, values, require_login=True):
         """
@@ -262,6 +328,46 @@ class WebAPI():
             self.session_manager.post, values, require_login=require_login
         )
 
+    def _call(self, _action, _require_login=True, **kwargs):
+        """
+        Make a get request for the given server action.
+
+        Args:
+          _action (str): The name of the server action.
+          _require_login (bool, optional): Whether to require the user to log
+              in before proceeding with the request.
+          **kwargs: The arguments to the server action.
+
+        Returns:
+          As for WebAPI._get.
+
+        Raises:
+          As for WebAPI._get.
+
+        """
+        kwargs['action'] = _action
+        return self._get(kwargs, require_login=_require_login)
+
+    def _call_post(self, _action, _require_login=True, **kwargs):
+        """
+        Make a post request for the given server action.
+
+        Args:
+          _action (str): The name of the server action.
+          _require_login (bool, optional): Whether to require the user to log
+              in before proceeding with the request.
+          **kwargs: The arguments to the server action.
+
+        Returns:
+          As for WebAPI._post.
+
+        Raises:
+          As for WebAPI._post.
+
+        """
+        kwargs['action'] = _action
+        return self._post(kwargs, require_login=_require_login)
+
     def _download(self, url, filename=None):
         """
         Download the object at the given URL to the given filename.
@@ -280,7 +386,9 @@ class WebAPI():
 
         """
         try:
-            filename = retrieve(url, filename=filename)
+            filename = retrieve(
+                url, filename=filename, urlopen=self.session_manager.urlopen
+            )
             return filename
         except Exception as e:
             raise WebAPIError(
@@ -288,6 +396,30 @@ class WebAPI():
                 details=str(e),
             ) from e
 
+    @staticmethod
+    def _decode_json(response):
+        """
+        Decode the given JSON response from the server.
+
+        Args:
+          response (str): The JSON response to decode.
+
+        Returns:
+          The decoded response.
+
+        Raises:
+          WebAPIError: If the response is not valid JSON.
+
+        """
+        try:
+            return json_loads(response)
+        except ValueError:
+            raise WebAPIError(
+                message='Invalid Response',
+                details='Could not decode response: {}'.format(response),
+            )  # do not explicitly chain -- not independently useful to caller
+
+    @ttl_cached(TIMESTAMP_TTL)
     def get_tutorials_timestamp(self):
         """
         Get the last-modified time of the version of the tutorial package on
@@ -296,11 +428,7 @@ class WebAPI():
         Returns:
           The timestamp, as a Unix time.
         """
-        values = {
-            'action': 'get_tutorials_timestamp'
-        }
-
-        result = self._get(values, require_login=False)
+        result = self._call('get_tutorials_timestamp', _require_login=False)
         return result.strip()
 
     def get_tutorials_zipfile(self):
@@ -314,11 +442,7 @@ class WebAPI():
           WebAPIError: If any exception is encountered in the download process.
 
         """
-        values = {
-            'action': 'get_tut_zip_file',
-        }
-
-        result = self._get(values, require_login=False)
+        result = self._call('get_tut_zip_file', _require_login=False)
         return self._download(result.strip())
 
     def get_mpt_zipfile(self):
@@ -332,13 +456,10 @@ class WebAPI():
           WebAPIError: If any exception is encountered in the download process.
 
         """
-        values = {
-            'action': 'get_mpt',
-        }
-
-        result = self._get(values, require_login=False)
+        result = self._call('get_mpt', _require_login=False)
         return self._download(result.strip())
 
+    @ttl_cached(VERSION_TTL)
     def get_version(self):
         """
         Get the latest MyPyTutor version.
@@ -350,10 +471,7 @@ class WebAPI():
           (basically, major.minor.bugfix).
 
         """
-        values = {
-            'action': 'get_version',
-        }
-        return self._get(values, require_login=False)
+        return self._call('get_version', _require_login=False)
 
     def upload_answer(self, tutorial, problem_set, tutorial_package, code):
         """
@@ -376,15 +494,13 @@ class WebAPI():
               too long for the server to accept).
 
         """
-        values = {
-            'action': 'upload',
-            'code': code,
-            'tutorial_package_name': tutorial_package.name,
-            'problem_set_name': problem_set.name,
-            'tutorial_name': tutorial.name,
-        }
-
-        result = self._post(values)
+        result = self._call_post(
+            'upload',
+            code=code,
+            tutorial_package_name=tutorial_package.name,
+            problem_set_name=problem_set.name,
+            tutorial_name=tutorial.name,
+        )
         return result.startswith(WebAPI.OK)
 
     def download_answer(self, tutorial, problem_set, tutorial_package):
@@ -403,13 +519,12 @@ class WebAPI():
           None if no code exists for the given tutorial.
 
         """
-        values = {
-            'action': 'download',
-            'tutorial_package_name': tutorial_package.name,
-            'problem_set_name': problem_set.name,
-            'tutorial_name': tutorial.name,
-        }
-        return self._get(values)
+        return self._call(
+            'download',
+            tutorial_package_name=tutorial_package.name,
+            problem_set_name=problem_set.name,
+            tutorial_name=tutorial.name,
+        )
 
     def answer_info(self, tutorial, problem_set, tutorial_package):
         """
@@ -440,23 +555,16 @@ class WebAPI():
               'timestamp' keys are missing on the response dictionary.
 
         """
-        values = {
-            'action': 'answer_info',
-            'tutorial_package_name': tutorial_package.name,
-            'problem_set_name': problem_set.name,
-            'tutorial_name': tutorial.name,
-        }
-        response = self._get(values)
+        response = self._call(
+            'answer_info',
+            tutorial_package_name=tutorial_package.name,
+            problem_set_name=problem_set.name,
+            tutorial_name=tutorial.name,
+        )
         if response is None:
             return None, None
 
-        try:
-            d = json.loads(response)
-        except ValueError:
-            raise WebAPIError(
-                message='Invalid Response',
-                details='Could not decode response: {}'.format(response),
-            )  # do not explicitly chain -- not independently useful to caller
+        d = self._decode_json(response)
 
         if 'hash' not in d or 'timestamp' not in d:
             raise WebAPIError(
@@ -469,6 +577,64 @@ class WebAPI():
 
         return answer_hash, timestamp
 
+    def answer_info_bulk(self, tutorial_package):
+        """
+        Return information on the server copy of the student's answer for
+        every tutorial in the given tutorial package.
+
+        This is equivalent to calling answer_info for each tutorial, but makes
+        only a single request to the server.
+
+        Args:
+          tutorial_package (TutorialPackage): The tutorial package to get the
+              info for.
+
+        Returns:
+          A dictionary mapping each Tutorial in the package to a two-element
+          tuple, in the same format as returned by answer_info.
+
+        Raises:
+          UnknownActionError: If the server does not support this request.
+          WebAPIError: If the response is not valid JSON, or if the 'hash' or
+              'timestamp' keys are missing on any element of the response.
+
+        """
+        tutorials = [
+            (problem_set.name, tutorial.name)
+            for problem_set in tutorial_package.problem_sets
+            for tutorial in problem_set
+        ]
+
+        response = self._call_post(
+            'answer_info_bulk',
+            tutorial_package_name=tutorial_package.name,
+            tutorials=json.dumps(tutorials),
+        )
+
+        d = self._decode_json(response) if response is not None else {}
+
+        if any('hash' not in i or 'timestamp' not in i
+               for ps_info in d.values() for i in ps_info.values()):
+            raise WebAPIError(
+                message='Invalid Response',
+                details='Missing keys on response: {}'.format(response),
+            )  # do not explicitly chain -- not independently useful to caller
+
+        output = {}
+
+        for problem_set in tutorial_package.problem_sets:
+            ps_info = d.get(problem_set.name, {})
+
+            for tutorial in problem_set:
+                info = ps_info.get(tutorial.name)
+                if info is None:
+                    output[tutorial] = None, None
+                else:
+                    answer_hash = base64.b32decode(info['hash'])
+                    output[tutorial] = answer_hash, info['timestamp']
+
+        return output
+
     def submit_answer(self, tutorial, code, num_attempts):
         """
         Submit the given code as the student's answer for the given tutorial.
@@ -489,15 +655,12 @@ class WebAPI():
               if the server response is not one of 'OK' or 'LATE'.
 
         """
-        tutorial_hash = base64.b32encode(tutorial.hash)
-
-        values = {
-            'action': 'submit',
-            'tutorial_hash': tutorial_hash,
-            'num_attempts': num_attempts,
-            'code': code,
-        }
-        response = self._post(values)
+        response = self._call_post(
+            'submit',
+            tutorial_hash=tutorial.b32_hash,
+            num_attempts=num_attempts,
+            code=code,
+        )
         if response is None:
             return None
 
@@ -518,15 +681,9 @@ class WebAPI():
         :return:
         """
 
-        hashes = [base64.b32encode(tutorial.hash) for tutorial in tutorials]
-        hashes = ",".join([hash.decode("utf-8") for hash in hashes])
+        hashes = ",".join(tutorial.b32_hash for tutorial in tutorials)
 
-        values = {
-            'action': 'reset_submissions',
-            'hashes': hashes
-        }
-
-        response = self._post(values)
+        response = self._call_post('reset_submissions', hashes=hashes)
         if response is None:
             return None
 
@@ -553,10 +710,7 @@ class WebAPI():
           As for _parse_submissions.
 
         """
-        values = {
-            'action': 'get_submissions',
-        }
-        response = self._get(values)
+        response = self._call('get_submissions')
 
         return self._parse_submissions(response, tutorial_package)
 
@@ -584,32 +738,80 @@ class WebAPI():
 
         """
         # parse our response
-        try:
-            results = json.loads(response)
-        except ValueError:
+        results = self._decode_json(response)
+
+        # check that our results are valid
+        bad_statuses = {status for _, status in results} - WebAPI.RESPONSES
+        if bad_statuses:
             raise WebAPIError(
                 message='Invalid Response',
-                details='Could not decode response: {}'.format(response),
-            )  # do not explicitly chain -- not independently useful to caller
+                details='Unknown submission status: {}'.format(
+                    ', '.join(sorted(map(str, bad_statuses)))
+                ),
+            )
 
-        # check that our results are valid, while building our output dict
-        output = {}
+        # build our output dict, ignoring tutorials not on this package
+        index = tutorial_package.b32_index
 
-        for b32_hash, status in results:
-            if status not in WebAPI.RESPONSES:
-                raise WebAPIError(
-                    message='Invalid Response',
-                    details='Unknown submission status: {}'.format(status),
-                )
+        return {
+            index[b32_hash]: status
+            for b32_hash, status in results if b32_hash in index
+        }
+
+    def prefetch_all(self, tutorial_package):
+        """
+        Fetch all of the information needed on startup concurrently.
 
-            tutorial_hash = base64.b32decode(b32_hash)
-            tutorial = tutorial_package.tutorial_with_hash(tutorial_hash)
-            if tutorial is None:
-                continue  # not on this package; ignore
+        The requests made here are independent of one another, and so the
+        public requests are run in parallel rather than waiting on each
+        response in turn.
 
-            output[tutorial] = status
+        Requests which require the user to be logged in are only made if the
+        user was logged in when this method was called.  If the server session
+        has since expired, the user may be prompted to login again, and so
+        these requests are made on the calling thread (while the public
+        requests are running) rather than in the worker threads.
 
-        return output
+        Args:
+          tutorial_package (TutorialPackage): The tutorial package to fetch
+              submissions and answer info for.
+
+        Returns:
+          A dictionary with the results of each request.
+
+          The 'version' and 'timestamp' keys will contain the results of
+          get_version and get_tutorials_timestamp respectively.
+
+          If the user is logged in, the 'submissions' and 'answer_info' keys
+          will contain the results of get_submissions and answer_info_bulk.
+
+        Raises:
+          WebAPIError: If any of the requests fail.
+
+        """
+        requests = {
+            'version': self.get_version,
+            'timestamp': self.get_tutorials_timestamp,
+        }
+
+        with ThreadPoolExecutor(len(requests)) as executor:
+            futures = {
+                key: executor.submit(request)
+                for key, request in requests.items()
+            }
+
+            results = {}
+            if self.is_logged_in:
+                results['submissions'] = self.get_submissions(tutorial_package)
+                results['answer_info'] = self.answer_info_bulk(
+                    tutorial_package
+                )
+
+            results.update(
+                (key, future.result()) for key, future in futures.items()
+            )
+
+        return results
 
     def provide_feedback(self, subject, feedback, code=''):
         """
@@ -621,13 +823,12 @@ class WebAPI():
           code (str, optional): The code the user was working on.
 
         """
-        values = {
-            'action': 'provide_feedback',
-            'subject': subject,
-            'feedback': feedback,
-            'code': code,
-        }
-        _ = self._get(values)
+        _ = self._call(
+            'provide_feedback',
+            subject=subject,
+            feedback=feedback,
+            code=code,
+        )
 
     # the following calls require admin access
     def get_student_results(self, user, tutorial_package):
@@ -648,10 +849,6 @@ class WebAPI():
           As for _parse_submissions.
 
         """
-        values = {
-            'action': 'get_student_results',
-            'user': user,
-        }
-        response = self._get(values)
+        response = self._call('get_student_results', user=user)
 
         return self._parse_submissions(response, tutorial_package)
@@ -0,0 +1,236 @@
+import http.client
+import threading
+import time
+import urllib.request
+
+
+class ConnectionPool():
+    """
+    A thread-safe pool of idle HTTP connections.
+
+    Connections are keyed by scheme and host, so that a connection is only ever
+    reused for requests to the server it was originally opened to.
+
+    Attributes:
+      max_idle (int): The maximum number of idle connections to keep open to
+          any one host.  Connections released beyond this limit are closed.
+      keepalive_expiry (float): How long, in seconds, a connection may sit idle
+          before it is closed rather than reused.
+
+    """
+    def __init__(self, max_idle=4, keepalive_expiry=60):
+        """
+        Initialise a new, empty ConnectionPool.
+
+        Args:
+          max_idle (int, optional): The maximum number of idle connections to
+              keep open to any one host.  Defaults to 4.
+          keepalive_expiry (float, optional): How long, in seconds, a
+              connection may sit idle before it is closed rather than reused.
+              Defaults to 60.  Servers close idle connections eventually, and
+              trying to reuse one which has been closed wastes a round trip.
+
+        """
+        self.max_idle = max_idle
+        self.keepalive_expiry = keepalive_expiry
+
+        self._lock = threading.Lock()
+        self._idle = {}
+
+    def acquire(self, key):
+        """
+        Remove and return an idle connection for the given key.
+
+        Args:
+          key (tuple): The (scheme, host) pair to get a connection for.
+
+        Returns:
+          An idle HTTPConnection, or None if there is no idle connection.
+
+        """
+        expired = []
+
+        with self._lock:
+            connections = self._idle.get(key, [])
+
+            # the most recently released connections are at the end, so once
+            # we find one which has expired, all remaining ones have too
+            while connections:
+                connection, released_at = connections.pop()
+                if time.monotonic() - released_at < self.keepalive_expiry:
+                    break
+                expired.append(connection)
+            else:
+                connection = None
+
+        for expired_connection in expired:
+            expired_connection.close()
+
+        return connection
+
+    def release(self, key, connection):
+        """
+        Return the given connection to the pool, so that it may be reused.
+
+        Args:
+          key (tuple): The (scheme, host) pair the connection is open to.
+          connection (HTTPConnection): The connection to release.  Any
+              response on this connection must already have been read.
+
+        """
+        with self._lock:
+            connections = self._idle.setdefault(key, [])
+            if len(connections) < self.max_idle:
+                connections.append((connection, time.monotonic()))
+                return
+
+        connection.close()
+
+    def close_all(self):
+        """
+        Close every idle connection in the pool.
+
+        """
+        with self._lock:
+            idle, self._idle = self._idle, {}
+
+        for connections in idle.values():
+            for connection, _ in connections:
+                connection.close()
+
+
+class _PooledResponse(http.client.HTTPResponse):
+    """
+    An HTTPResponse which returns its connection to the pool once the body of
+    the response has been completely read.
+
+    If the response is closed before the body has been read to the end, the
+    unread data would be read as the start of the next response, and so the
+    connection is closed instead.
+
+    """
+    _release = None
+    _discard = None
+
+    def _close_conn(self):
+        super()._close_conn()
+
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    def close(self):
+        # fp is only cleared by _close_conn once the body has been read to EOF
+        if self.fp is not None:
+            self._release = None
+
+            discard, self._discard = self._discard, None
+            if discard is not None:
+                discard()
+
+        super().close()
+
+
+class _KeepAliveMixin():
+    """
+    Mixin for urllib handlers which reuses connections from a ConnectionPool,
+    rather than opening (and closing) a new connection for every request.
+
+    This is a replacement for AbstractHTTPHandler.do_open, and so handles all
+    of the cookie, redirect, and error processing of the standard handlers.
+
+    """
+    # errors which indicate that the server closed an idle connection
+    # (ConnectionError includes the aborted, reset and broken pipe errors
+    # raised on the various platforms)
+    STALE_ERRORS = (
+        http.client.BadStatusLine,  # includes RemoteDisconnected
+        ConnectionError,
+    )
+
+    def _keepalive_open(self, connection_class, req, **kwargs):
+        host = req.host
+        if not host:
+            raise urllib.request.URLError('no host given')
+
+        key = (req.type, host)
+
+        # try an idle connection first, but it may have been closed by the
+        # server since we last used it; if so, fall back to a new connection
+        connection = self.pool.acquire(key)
+        if connection is not None:
+            try:
+                response = self._send(connection, req)
+            except self.STALE_ERRORS:
+                connection.close()
+                connection = None
+            except Exception as e:
+                connection.close()
+                raise urllib.request.URLError(e)
+
+        if connection is None:
+            connection = connection_class(host, timeout=req.timeout, **kwargs)
+            try:
+                response = self._send(connection, req)
+            except OSError as e:
+                connection.close()
+                raise urllib.request.URLError(e)
+
+        # the connection can only be reused once the response has been read
+        if not response.will_close:
+            release = lambda: self.pool.release(key, connection)
+            if response.isclosed():
+                release()
+            else:
+                response._release = release
+                response._discard = connection.close
+
+        # as for AbstractHTTPHandler.do_open
+        response.url = req.get_full_url()
+        response.msg = response.reason
+        return response
+
+    def _send(self, connection, req):
+        headers = dict(req.unredirected_hdrs)
+        headers.update(
+            (k, v) for k, v in req.headers.items() if k not in headers
+        )
+        headers = {name.title(): value for name, value in headers.items()}
+
+        connection.response_class = _PooledResponse
+        connection.request(
+            req.get_method(), req.selector, req.data, headers,
+            encode_chunked=req.has_header('Transfer-encoding'),
+        )
+        return connection.getresponse()
+
+
+class KeepAliveHTTPHandler(_KeepAliveMixin, urllib.request.HTTPHandler):
+    """
+    An HTTPHandler which keeps connections alive between requests.
+
+    """
+    def __init__(self, pool, debuglevel=0):
+        super().__init__(debuglevel=debuglevel)
+        self.pool = pool
+
+    def http_open(self, req):
+        return self._keepalive_open(http.client.HTTPConnection, req)
+
+
+class KeepAliveHTTPSHandler(_KeepAliveMixin, urllib.request.HTTPSHandler):
+    """
+    An HTTPSHandler which keeps connections alive between requests.
+
+    Reusing a connection avoids repeating the TLS handshake for each request.
+
+    """
+    def __init__(self, pool, debuglevel=0, context=None):
+        super().__init__(debuglevel=debuglevel, context=context)
+        self.pool = pool
+        self._ssl_context = context
+
+    def https_open(self, req):
+        return self._keepalive_open(
+            http.client.HTTPSConnection, req, context=self._ssl_context
+        )
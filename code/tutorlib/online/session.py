@@ -27,15 +27,20 @@
 # These methods return a string with the response, or raise a RequestError if
 # there was something wrong with the request.
 
+import gzip
 import http.cookiejar
 import http.client
 import json
 import urllib.parse
 import urllib.request
+import urllib.response
 
+from tutorlib.config.shared import VERSION
 from tutorlib.gui.dialogs.login import LoginDialog
 import tutorlib.utils.messagebox as tkmessagebox
 from tutorlib.online.exceptions import AuthError, BadResponse, RequestError
+from tutorlib.online.keepalive import ConnectionPool, KeepAliveHTTPHandler, \
+        KeepAliveHTTPSHandler
 from tutorlib.online.parser import FormParser, strip_header
 
 
@@ -44,12 +49,57 @@ LOGOUT_URL = 'http://api.uqcloud.net/logout'
 SERVER = 'http://csse1001.uqcloud.net/cgi-bin/mpt3/mpt_cgi.py'
 
 
-def make_opener():
-    """Make a URL opener with cookies enabled, and proxies disabled."""
+class _GzipResponse(urllib.response.addinfourl):
+    """A response which transparently decompresses a gzip-encoded response."""
+
+    def __init__(self, response):
+        super().__init__(
+            gzip.GzipFile(fileobj=response, mode='rb'),
+            response.headers, response.url, response.status,
+        )
+        self.msg = response.msg
+        self._response = response
+
+    def close(self):
+        super().close()
+        self._response.close()
+
+
+class GzipProcessor(urllib.request.BaseHandler):
+    """A handler which asks the server to gzip its responses, and decompresses
+    them when it does.
+    """
+    handler_order = 900  # before errors are handled
+
+    def http_request(self, request):
+        request.add_unredirected_header('Accept-Encoding', 'gzip')
+        return request
+
+    def http_response(self, request, response):
+        if response.headers.get('Content-Encoding') == 'gzip':
+            return _GzipResponse(response)
+        return response
+
+    https_request = http_request
+    https_response = http_response
+
+
+def make_opener(pool):
+    """Make a URL opener with cookies enabled, and proxies disabled.
+    Connections are kept alive in the given `pool`, so that consecutive
+    requests to the same server reuse the one connection, and responses are
+    gzip-compressed where the server supports it.
+    """
     cookiejar = http.cookiejar.CookieJar()
     proxy_handler = urllib.request.ProxyHandler(proxies={})
     cookie_processor = urllib.request.HTTPCookieProcessor(cookiejar=cookiejar)
-    opener = urllib.request.build_opener(cookie_processor, proxy_handler)
+    opener = urllib.request.build_opener(
+        cookie_processor, proxy_handler, GzipProcessor(),
+        KeepAliveHTTPHandler(pool), KeepAliveHTTPSHandler(pool),
+    )
+
+    opener.addheaders = [('User-Agent', 'MyPyTutor/{}'.format(VERSION))]
+
     return opener
 
 
@@ -69,7 +119,8 @@ class SessionManager:
         self._url = url
         self._callback = listener
         self._user = None
-        self._opener = make_opener()
+        self._pool = ConnectionPool()
+        self._opener = make_opener(self._pool)
 
     def user_info(self):
         return self._user
@@ -163,9 +214,17 @@ class SessionManager:
     def logout(self):
         """Log out of the system."""
         self._open(LOGOUT_URL)
+        self._pool.close_all()
         self._user = None
         self._callback()
 
+    def urlopen(self, url):
+        """Open the given URL, using this session's cookies and connections.
+        Return the response object, or raise a RequestError if the URL could
+        not be opened.
+        """
+        return self._open(url)
+
     def _open(self, url, data=None):
         try:
             return self._opener.open(url, data)
@@ -196,6 +255,7 @@ class SessionManager:
         response = self._open(url, data)
         if urllib.parse.urlsplit(response.geturl()).netloc == LOGIN_DOMAIN:
             # The user needs to log in
+            response.close()
             self.login()
             response = self._open(url, data)
         text = response.read().decode('utf8')
@@ -1,6 +1,8 @@
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
 
+from tutorlib.interface.web_api import UnknownActionError
+
 
 class SyncClient():
     def __init__(self, web_api):
@@ -96,11 +98,14 @@ class SyncClient():
             tutorial, problem_set, tutorial_package
         )
 
-    def _do_sync(self, tutorial, tutorial_package):
+    def _do_sync(self, tutorial, tutorial_package, answer_info=None):
         def f():
-            remote_hash, remote_mtime = self.get_answer_info(
-                tutorial, tutorial_package
-            )
+            if answer_info is None:
+                remote_hash, remote_mtime = self.get_answer_info(
+                    tutorial, tutorial_package
+                )
+            else:
+                remote_hash, remote_mtime = answer_info
 
             if not tutorial.has_answer:
                 if remote_hash is not None:  # there exists a remote copy
@@ -117,8 +122,7 @@ class SyncClient():
             else:
                 success = self.download_answer(tutorial, tutorial_package)
 
-            if not success:
-                return False
+            return success
 
         def try_repeatedly(f, n=3):
             def fn():
@@ -153,13 +157,23 @@ class SyncClient():
           tutorial_package (TutorialPackage): The tutorial package to sync.
 
         """
+        # fetch the server info for every tutorial in a single request
+        # older servers do not support this, so fall back to each worker
+        # requesting the info for its own tutorial
+        try:
+            answer_info = self.web_api.answer_info_bulk(tutorial_package)
+        except UnknownActionError:
+            answer_info = {}
+
         max_workers = len(tutorial_package.problem_sets)
         with ThreadPoolExecutor(max_workers) as executor:
             futures = []
 
             for problem_set in tutorial_package.problem_sets:
                 for tutorial in problem_set:
-                    executor.submit(self._do_sync(tutorial, tutorial_package))
+                    executor.submit(self._do_sync(
+                        tutorial, tutorial_package, answer_info.get(tutorial)
+                    ))
 
             success = True
             for future in as_completed(futures):
@@ -9,19 +9,24 @@ Attributes:
       student in their own code.
 
 """
-import copy
 import inspect
 from io import StringIO
 import unittest
 
-from tutorlib.testing.streams \
-        import redirect_stdin, redirect_stdout, redirect_stderr, \
-        redirect_input_prompt
+from tutorlib.testing.streams import redirect_all
 from tutorlib.testing.support import trim_indentation
 
 STUDENT_LOCALS_NAME = 'student_lcls'
 TEST_RESULT_IDENTIFIER = '__test_result'
 
+# compiled (function definition, test statement) code objects, keyed by the
+# filename and code object of the test function
+# code objects compare by value, so this also hits when the tests module has
+# been re-executed and the test function is unchanged
+# that comparison ignores the filename (hence it being part of the key) and
+# default argument values (so functions with defaults are never cached)
+_COMPILED_CACHE = {}
+
 
 class StudentTestCase(unittest.TestCase):
     """
@@ -90,25 +95,40 @@ class StudentTestCase(unittest.TestCase):
         assert STUDENT_LOCALS_NAME in globals(), \
                 'Could not find {} in globals()'.format(STUDENT_LOCALS_NAME)
         student_lcls = globals()[STUDENT_LOCALS_NAME]
-        lcls = copy.copy(student_lcls)
-
-        function_source = trim_indentation(inspect.getsource(f))
-        exec(compile(function_source, '<test_function>', 'exec'), lcls)
-
-        # we now have our function, as an object, in the context of the
-        # student code
-        # now we need to actually *run* it, and extract the output, in that
-        # same context, and again we need a string for that
-        function_name = f.__name__
-        test_statement = '{} = {}()'.format(
-            TEST_RESULT_IDENTIFIER, function_name
-        )
+        lcls = student_lcls.copy()
+
+        # compiling involves reading the source of f from disk, so cache the
+        # results, as the same test functions are run over and over again
+        if f.__defaults__ is None and f.__kwdefaults__ is None:
+            cache_key = f.__code__.co_filename, f.__code__
+        else:
+            cache_key = None
+
+        try:
+            function_code, statement_code = _COMPILED_CACHE[cache_key]
+        except KeyError:
+            function_source = trim_indentation(inspect.getsource(f))
+            function_code = compile(function_source, '<test_function>', 'exec')
+
+            # once the function has been executed below, we will have it as an
+            # object in the context of the student code
+            # we then need to actually *run* it, and extract the output, in
+            # that same context, and again we need a string for that
+            function_name = f.__name__
+            test_statement = '{} = {}()'.format(
+                TEST_RESULT_IDENTIFIER, function_name
+            )
+            statement_code = compile(test_statement, '<test_run>', 'single')
+
+            if cache_key is not None:
+                _COMPILED_CACHE[cache_key] = function_code, statement_code
+
+        exec(function_code, lcls)
 
         # finally, actually execute that test function, and extract the result
-        with redirect_stdin(input_stream), redirect_stdout(output_stream), \
-                redirect_stderr(error_stream), \
-                redirect_input_prompt(lcls, input_prompts_stream):
-            exec(compile(test_statement, '<test_run>', 'single'), lcls)
+        with redirect_all(input_stream, output_stream, error_stream,
+                          lcls, input_prompts_stream):
+            exec(statement_code, lcls)
             result = lcls[TEST_RESULT_IDENTIFIER]
 
         self.standard_output = output_stream.getvalue()
@@ -91,4 +91,30 @@ class redirect_input_prompt():
         if 'input' in self._gbls:
             self._gbls['input'] = self._real_input
         else:
-            self._gbls['__builtins__']['input'] = self._real_input
\ No newline at end of file
+            self._gbls['__builtins__']['input'] = self._real_input
+
+
+class redirect_all():
+    """
+    Context manager which redirects stdin, stdout, stderr and input() prompts.
+
+    This is equivalent to nesting redirect_stdin, redirect_stdout,
+    redirect_stderr and redirect_input_prompt, but with a single enter and exit.
+
+    """
+    def __init__(self, stdin, stdout, stderr, gbls, prompt_target=None):
+        self._new_targets = (stdin, stdout, stderr)
+        self._input_prompt = redirect_input_prompt(gbls, prompt_target)
+        # Use list for re-entrancy
+        self._old_targets = []
+
+    def __enter__(self):
+        self._input_prompt.__enter__()
+
+        self._old_targets.append((sys.stdin, sys.stdout, sys.stderr))
+        sys.stdin, sys.stdout, sys.stderr = self._new_targets
+
+    def __exit__(self, exctype, excinst, exctb):
+        sys.stdin, sys.stdout, sys.stderr = self._old_targets.pop()
+
+        self._input_prompt.__exit__(exctype, excinst, exctb)
@@ -1,4 +1,5 @@
 from functools import partial, wraps
+import time
 
 
 def skip_if_attr(attr, val):
@@ -12,4 +13,29 @@ def skip_if_attr(attr, val):
     return wrapper
 
 
-skip_if_attr_none = partial(skip_if_attr, val=None)
\ No newline at end of file
+skip_if_attr_none = partial(skip_if_attr, val=None)
+
+
+def ttl_cached(ttl):
+    """
+    Cache the result of the decorated (argumentless) method for ttl seconds.
+
+    Results are stored in the instance's `_ttl_cache` dictionary, keyed by the
+    method name, so that the instance can invalidate them by clearing it.
+
+    """
+    def wrapper(f):
+        @wraps(f)
+        def method(self):
+            now = time.monotonic()
+
+            expiry, value = self._ttl_cache.get(f.__name__, (now, None))
+            if now < expiry:
+                return value
+
+            value = f(self)
+            if value is not None:
+                self._ttl_cache[f.__name__] = now + ttl, value
+            return value
+        return method
+    return wrapper
\ No newline at end of file
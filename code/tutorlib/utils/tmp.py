@@ -5,6 +5,8 @@ from urllib.request import urlopen
 
 from tutorlib.config.shared import TMP_DIRECTORY
 
+RETRIEVE_CHUNK_SIZE = 64*1024
+
 
 def mkstemp(suffix='', prefix='tmp', dir=TMP_DIRECTORY, text=False):
     """
@@ -17,24 +19,44 @@ def mkstemp(suffix='', prefix='tmp', dir=TMP_DIRECTORY, text=False):
     return _mkstemp(suffix=suffix, prefix=prefix, dir=dir, text=text)
 
 
-def retrieve(url, filename=None):
+def retrieve(url, filename=None, urlopen=urlopen):
     """
     Retrieve the object at the given URL, and store it to the local filesystem.
 
+    The object is streamed to disk in chunks, rather than being read into
+    memory in full.  If a filename is given, the object is first written to a
+    temporary file alongside it, which is only moved into place once the
+    download completes, so that a failed download never leaves a partial file
+    at `filename`.
+
     Args:
       url (str): The URL to retrieve.
       filename (str, optional): The path to save the retrieved file to.
         If None, the file will be saved to the MyPyTutor temporary directory.
+      urlopen ((str) -> file, optional): The function to use to open the URL.
+        Defaults to urllib.request.urlopen.
 
     Returns:
       The path to the downloaded file.
 
     """
     if filename is None:
-        _, filename = mkstemp()
-
-    with urlopen(url) as response, open(filename, 'wb') as f:
-        copyfileobj(response, f)
+        # nothing else knows about a fresh temporary file, so there is no
+        # need to download it elsewhere first; just stream into it
+        fd, filename = mkstemp()
+        partial_path = None
+    else:
+        directory = os.path.dirname(os.path.abspath(filename))
+        fd, partial_path = _mkstemp(suffix='.part', dir=directory)
+
+    try:
+        with os.fdopen(fd, 'wb') as f, urlopen(url) as response:
+            copyfileobj(response, f, RETRIEVE_CHUNK_SIZE)
+        if partial_path is not None:
+            os.replace(partial_path, filename)
+    except Exception:
+        os.remove(partial_path if partial_path is not None else filename)
+        raise
 
     return filename
 